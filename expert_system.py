@@ -1,222 +1,332 @@
 import logging
-from typing import Dict, List, Any
+import re
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 
+_LOG = logging.getLogger(__name__)
+
+# Most recent cases kept on a blackboard when history recording is enabled
+CASE_HISTORY_LIMIT = 1000
+
+# Share of severe symptoms the doctor needs before approving a complex case
+CONFIDENCE_THRESHOLD = 0.7
+
+@dataclass(slots=True)
+class Facts:
+    """Facts known about a single medical certificate case"""
+    student_id: Optional[str] = None
+    has_excuse_letter: bool = False
+    symptoms: Sequence[str] = ()
+    illness_type: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    valid_id: bool = False
+    parent_guardian_verified: bool = False
+
+    @classmethod
+    def from_dict(cls, case_data):
+        """Build facts from a case dict, ignoring keys the rules don't use.
+
+        Raises ValueError if a field has a type the rules cannot work with.
+        """
+        if not isinstance(case_data, Mapping):
+            raise ValueError(f"case data must be a mapping, not {type(case_data).__name__}")
+        facts = cls(**{name: case_data[name] for name in _FACT_FIELDS
+                       if name in case_data})
+        # Any iterable of strings will do; it is kept as a tuple. A bare
+        # string is refused rather than read as a list of characters.
+        symptoms = facts.symptoms
+        if not isinstance(symptoms, tuple):
+            if isinstance(symptoms, str):
+                raise ValueError("symptoms must be a list of strings")
+            try:
+                symptoms = facts.symptoms = tuple(symptoms)
+            except TypeError:
+                raise ValueError("symptoms must be a list of strings") from None
+        if not all(isinstance(symptom, str) for symptom in symptoms):
+            raise ValueError("symptoms must be a list of strings")
+        if facts.timestamp is not None and not isinstance(facts.timestamp, datetime):
+            raise ValueError("timestamp must be a datetime")
+        return facts
+
+_FACT_FIELDS = tuple(f.name for f in fields(Facts))
+
+@dataclass(slots=True)
+class Decisions:
+    """Intermediate and final decisions reached for a single case"""
+    nurse_assessment: Optional[Dict[str, Any]] = None
+    doctor_review: Optional[Dict[str, Any]] = None
+    final_decision: Optional[Dict[str, Any]] = None
+
 class Blackboard:
     """Shared knowledge space for the expert system"""
     def __init__(self):
-        self.facts = {
-            'student_id': None,
-            'has_excuse_letter': False,
-            'symptoms': [],
-            'illness_type': None,
-            'timestamp': None,
-            'valid_id': False,
-            'parent_guardian_verified': False
-        }
-        self.intermediate_decisions = {
-            'nurse_assessment': None,
-            'doctor_review': None,
-            'final_decision': None
-        }
-        self.case_history = []
+        self.case_history = deque(maxlen=CASE_HISTORY_LIMIT)
 
-class ExpertSource:
-    def __init__(self, name):
-        self.name = name
-        self.confidence_threshold = 0.7
+# Symptom lexicons used by the nurse and doctor rules
+SIMPLE_CASES = frozenset({
+    'cold', 'flu', 'cough', 'headache',
+    'fever', 'stomach_ache', 'sore throat'
+})
+COMPLEX_CONDITIONS = frozenset({
+    'recurring fever', 'severe injury', 'chronic pain',
+    'mental health', 'surgery recovery', 'infectious disease'
+})
 
-    def can_handle(self, facts):
-        raise NotImplementedError("Expert source must implement can_handle")
+# Simple cases match whole symptoms, so a set lookup is enough; complex
+# conditions match anywhere inside a symptom ("mental health issues") and
+# are compiled into one alternation, longest phrase first
+_SIMPLE_LC = frozenset(c.lower() for c in SIMPLE_CASES)
+_COMPLEX_RE = re.compile('|'.join(
+    map(re.escape, sorted((c.lower() for c in COMPLEX_CONDITIONS), key=len, reverse=True))
+))
 
-    def evaluate(self, facts):
-        raise NotImplementedError("Expert source must implement evaluate")
+def _classify(symptoms):
+    """Tally how many symptoms are simple cases and how many are complex."""
+    simple_hits = complex_hits = 0
+    simple_lc = _SIMPLE_LC
+    search = _COMPLEX_RE.search
+    for symptom in map(str.lower, symptoms):
+        if symptom in simple_lc:
+            simple_hits += 1
+        if search(symptom) is not None:
+            complex_hits += 1
+    return simple_hits, complex_hits
 
-class NurseExpert(ExpertSource):
-    def __init__(self):
-        super().__init__("Nurse")
-        self.simple_cases = {
-            'cold', 'flu', 'cough', 'headache', 
-            'fever', 'stomach_ache', 'sore throat'
-        }
+def _classify_symptoms(symptoms):
+    """Return (is_simple, severity) for a list of symptoms."""
+    return _classify_symptom_tuple(tuple(symptoms))
 
-    def can_handle(self, facts):
-        return facts['has_excuse_letter'] and facts['student_id']
-
-    def evaluate(self, facts):
-        # Rule 1: No excuse letter or invalid ID
-        if not facts['has_excuse_letter'] or not facts['valid_id']:
-            return {
-                'decision': 'reject',
-                'reason': 'No valid excuse letter or ID',
-                'complexity': 'simple'
-            }
-        
-        # Rule 2: Simple illness with valid documentation
-        illness_complexity = self._determine_complexity(facts['symptoms'])
-        if illness_complexity == 'simple':
-            return {
-                'decision': 'approve',
-                'reason': 'Simple case with valid documentation',
-                'complexity': 'simple'
-            }
-        
-        # Rule 3: Complex case needs doctor review
-        return {
-            'decision': 'refer',
-            'reason': 'Complex case needs doctor review',
-            'complexity': 'complex'
-        }
+@lru_cache(maxsize=1024)
+def _classify_symptom_tuple(symptoms):
+    simple_hits, complex_hits = _classify(symptoms)
+    return simple_hits > 0, complex_hits / max(1, len(symptoms))
 
-    def _determine_complexity(self, symptoms):
-        if any(symptom.lower() in self.simple_cases for symptom in symptoms):
-            return 'simple'
-        return 'complex'
+@lru_cache(maxsize=256)
+def _format_minute(minute, fmt):
+    """strftime for a minute-truncated naive datetime, shared across cases"""
+    return minute.strftime(fmt)
 
-class DoctorExpert(ExpertSource):
-    def __init__(self):
-        super().__init__("Doctor")
-        self.complex_conditions = {
-            'recurring fever', 'severe injury', 'chronic pain',
-            'mental health', 'surgery recovery', 'infectious disease'
-        }
+def _record_id(student_id, timestamp):
+    minute = timestamp.replace(second=0, microsecond=0, tzinfo=None)
+    return f"MC-{student_id}-{_format_minute(minute, '%Y%m%d%H%M')}"
 
-    def can_handle(self, facts):
-        return facts['has_excuse_letter'] and facts['illness_type'] == 'complex'
-
-    def evaluate(self, facts):
-        # Rule 4: Doctor's evaluation for complex cases
-        if not self._validate_documentation(facts):
-            return {
-                'decision': 'reject',
-                'reason': 'Insufficient documentation for complex case'
-            }
-
-        severity = self._assess_severity(facts['symptoms'])
-        if severity >= self.confidence_threshold:
-            return {
-                'decision': 'approve',
-                'reason': 'Complex case validated and approved',
-                'severity': severity
-            }
-        return {
-            'decision': 'reject',
-            'reason': 'Condition does not warrant certificate'
-        }
+# Static rule outcomes, frozen and shared by every evaluation. They stay
+# internal: the public entry points hand callers a plain dict copy.
+_REJECT_NO_DOCUMENTS = MappingProxyType({
+    'decision': 'reject',
+    'reason': 'No valid excuse letter or ID',
+    'complexity': 'simple'
+})
+_APPROVE_SIMPLE = MappingProxyType({
+    'decision': 'approve',
+    'reason': 'Simple case with valid documentation',
+    'complexity': 'simple'
+})
+_REFER_COMPLEX = MappingProxyType({
+    'decision': 'refer',
+    'reason': 'Complex case needs doctor review',
+    'complexity': 'complex'
+})
+_REJECT_INSUFFICIENT_DOCUMENTATION = MappingProxyType({
+    'decision': 'reject',
+    'reason': 'Insufficient documentation for complex case'
+})
+_REJECT_NOT_WARRANTED = MappingProxyType({
+    'decision': 'reject',
+    'reason': 'Condition does not warrant certificate'
+})
+_REJECT_MISSING_FIELDS = MappingProxyType({
+    'decision': 'reject',
+    'reason': 'Missing required information for record'
+})
 
-    def _validate_documentation(self, facts):
-        return (facts['has_excuse_letter'] and 
-                facts['valid_id'] and 
-                len(facts['symptoms']) > 0)
+# Templates for outcomes that carry per-case fields
+_APPROVE_COMPLEX_TEMPLATE = MappingProxyType({
+    'decision': 'approve',
+    'reason': 'Complex case validated and approved'
+})
 
-    def _assess_severity(self, symptoms):
-        severe_symptoms = sum(1 for s in symptoms 
-                            if any(c in s.lower() for c in self.complex_conditions))
-        return severe_symptoms / max(1, len(symptoms))
+# Fact flags packed into one int for the fused rule cascade
+EXCUSE = 1
+VALID_ID = 2
+SIMPLE = 4
+HAS_SYMPTOMS = 8
+SEVERE = 16
+RECORDABLE = 32
+_DOCUMENTED = EXCUSE | VALID_ID
+_DOCTOR_APPROVE = HAS_SYMPTOMS | SEVERE
+_STAFF_RECORD = HAS_SYMPTOMS | RECORDABLE
 
-class ClinicStaffExpert(ExpertSource):
-    def __init__(self):
-        super().__init__("Clinic Staff")
-        self.required_fields = {
-            'student_id', 'symptoms', 'timestamp',
-            'has_excuse_letter', 'valid_id'
-        }
+# The fused nurse -> doctor -> staff cascade. The flag masks and the
+# confidence threshold are bound as keyword defaults so the hot path reads
+# locals instead of module globals; callers never pass them.
+def _evaluate_fused(facts, decisions, *, EXCUSE=EXCUSE, VALID_ID=VALID_ID,
+                    SIMPLE=SIMPLE, HAS_SYMPTOMS=HAS_SYMPTOMS, SEVERE=SEVERE,
+                    RECORDABLE=RECORDABLE, _DOCUMENTED=_DOCUMENTED,
+                    _DOCTOR_APPROVE=_DOCTOR_APPROVE, _STAFF_RECORD=_STAFF_RECORD,
+                    CONFIDENCE_THRESHOLD=CONFIDENCE_THRESHOLD):
+    """Run the nurse, doctor and staff rules in one pass over the facts.
 
-    def can_handle(self, facts):
-        return all(field in facts for field in self.required_fields)
-
-    def evaluate(self, facts):
-        # Rule 5: Record keeping for approved cases
-        if not self._validate_fields(facts):
-            return {
-                'decision': 'reject',
-                'reason': 'Missing required information for record'
-            }
-        
-        return {
-            'decision': 'record',
-            'reason': 'Case recorded in system',
-            'record_id': self._generate_record_id(facts),
-            'record_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+    Each field is read once into a flag mask and symptoms are classified
+    once; the nurse and doctor outcomes are written to decisions and the
+    final one is returned.
+    """
+    mask = ((EXCUSE if facts.has_excuse_letter else 0) |
+            (VALID_ID if facts.valid_id else 0))
 
-    def _validate_fields(self, facts):
-        return all(facts.get(field) for field in self.required_fields)
+    # Step 1: Nurse Assessment (rule 1)
+    if mask & _DOCUMENTED != _DOCUMENTED:
+        decisions.nurse_assessment = _REJECT_NO_DOCUMENTS
+        decisions.final_decision = _REJECT_NO_DOCUMENTS
+        return _REJECT_NO_DOCUMENTS
 
-    def _generate_record_id(self, facts):
-        return f"MC-{facts['student_id']}-{facts['timestamp'].strftime('%Y%m%d%H%M')}"
+    symptoms = facts.symptoms
+    student_id = facts.student_id
+    timestamp = facts.timestamp
+    is_simple, severity = _classify_symptoms(symptoms)
+    mask |= ((SIMPLE if is_simple else 0) |
+             (HAS_SYMPTOMS if symptoms else 0) |
+             (SEVERE if severity >= CONFIDENCE_THRESHOLD else 0) |
+             (RECORDABLE if student_id and timestamp else 0))
+
+    if mask & SIMPLE:
+        # Rule 2: simple case, approved by the nurse
+        decisions.nurse_assessment = _APPROVE_SIMPLE
+        approved_by = 'nurse'
+    else:
+        # Rule 3 refers to the doctor, Step 2: Doctor Review (rule 4)
+        decisions.nurse_assessment = _REFER_COMPLEX
+        if mask & _DOCTOR_APPROVE == _DOCTOR_APPROVE:
+            decisions.doctor_review = {**_APPROVE_COMPLEX_TEMPLATE, 'severity': severity}
+        else:
+            doctor_decision = (_REJECT_NOT_WARRANTED if mask & HAS_SYMPTOMS
+                               else _REJECT_INSUFFICIENT_DOCUMENTATION)
+            decisions.doctor_review = doctor_decision
+            decisions.final_decision = doctor_decision
+            return doctor_decision
+        approved_by = 'doctor'
+
+    # Step 3: Clinic Staff Recording (rule 5)
+    if mask & _STAFF_RECORD == _STAFF_RECORD:
+        final_decision = {
+            'decision': 'approve',
+            'record_id': _record_id(student_id, timestamp),
+            'approved_by': approved_by
+        }
+    else:
+        final_decision = _REJECT_MISSING_FIELDS
+    decisions.final_decision = final_decision
+    return final_decision
 
 class ControlShell:
     def __init__(self):
         self.blackboard = Blackboard()
-        self.experts = {
-            'nurse': NurseExpert(),
-            'doctor': DoctorExpert(),
-            'staff': ClinicStaffExpert()
-        }
+        self.record_history = False
+        self._decide = _evaluate_fused
 
-    def process_case(self, case_data):
-        """Process a medical certificate case through the expert system."""
-        try:
-            # Initialize blackboard with case data
-            self.blackboard.facts.update(case_data)
-            
-            # Add default valid_id if not provided (for compatibility)
-            if 'valid_id' not in self.blackboard.facts:
-                self.blackboard.facts['valid_id'] = True
-            
-            # Step 1: Nurse Assessment
-            nurse_decision = self.experts['nurse'].evaluate(self.blackboard.facts)
-            self.blackboard.intermediate_decisions['nurse_assessment'] = nurse_decision
-
-            if nurse_decision['decision'] == 'reject':
-                self.blackboard.intermediate_decisions['final_decision'] = nurse_decision
-                return nurse_decision
-
-            # Step 2: Doctor Review (if needed)
-            if nurse_decision['decision'] == 'refer' or nurse_decision.get('complexity') == 'complex':
-                doctor_decision = self.experts['doctor'].evaluate(self.blackboard.facts)
-                self.blackboard.intermediate_decisions['doctor_review'] = doctor_decision
-                if doctor_decision['decision'] == 'reject':
-                    self.blackboard.intermediate_decisions['final_decision'] = doctor_decision
-                    return doctor_decision
-
-            # Step 3: Clinic Staff Recording
-            staff_decision = self.experts['staff'].evaluate(self.blackboard.facts)
-            if staff_decision['decision'] == 'record':
-                final_decision = {
-                    'decision': 'approve',
-                    'record_id': staff_decision['record_id'],
-                    'approved_by': 'nurse' if nurse_decision['complexity'] == 'simple' else 'doctor'
-                }
-            else:
-                final_decision = staff_decision
-
-            self.blackboard.intermediate_decisions['final_decision'] = final_decision
+    def process_case(self, case_data, record_history=None):
+        """Process a medical certificate case through the expert system.
+
+        Facts and decisions are scoped to this call, so one shell can be
+        shared across cases; the case is appended to the blackboard history
+        only when recording is enabled on the shell or for this call.
+        Raises ValueError for malformed case data.
+        """
+        if record_history is None:
+            record_history = self.record_history
+
+        # Per-case facts; unspecified fields keep the Facts defaults
+        if isinstance(case_data, Facts):
+            facts = case_data
+        else:
+            facts = Facts.from_dict(case_data)
+        decisions = Decisions()
+
+        final_decision = self._decide(facts, decisions)
+        if record_history:
             self.blackboard.case_history.append({
-                'facts': self.blackboard.facts.copy(),
-                'decisions': self.blackboard.intermediate_decisions.copy()
+                'facts': facts,
+                'decisions': decisions
             })
-            
-            return final_decision
-            
-        except Exception as e:
-            logging.error(f"Error in expert system: {str(e)}")
-            return {
-                'decision': 'reject',
-                'reason': f'System error: {str(e)}',
-                'complexity': 'unknown'
-            }
+
+        return dict(final_decision)
+
+# Stand-ins for the per-case identity fields while a canonical decision is cached
+_PLACEHOLDER_STUDENT = 'cached'
+_PLACEHOLDER_TIMESTAMP = datetime(2000, 1, 1)
+
+@lru_cache(maxsize=4096)
+def _analyze_cached(has_excuse, valid_id, symptoms, recordable):
+    """Final decision for a canonical case, record ids use placeholders"""
+    facts = Facts(
+        student_id=_PLACEHOLDER_STUDENT if recordable else None,
+        has_excuse_letter=has_excuse,
+        symptoms=symptoms,
+        timestamp=_PLACEHOLDER_TIMESTAMP if recordable else None,
+        valid_id=valid_id
+    )
+    return _evaluate_fused(facts, Decisions())
+
+def _case_key(case_data):
+    """Validated facts for a case and the canonical key its decision is cached on.
+
+    Raises ValueError for malformed case data.
+    """
+    facts = case_data if isinstance(case_data, Facts) else Facts.from_dict(case_data)
+    return facts, (
+        bool(facts.has_excuse_letter),
+        bool(facts.valid_id),
+        tuple(sorted(symptom.lower() for symptom in facts.symptoms)),
+        bool(facts.student_id and facts.timestamp)
+    )
+
+def _case_result(result, facts):
+    """Copy a canonical decision for one case, with its own record id"""
+    if 'record_id' in result:
+        return {**result, 'record_id': _record_id(facts.student_id, facts.timestamp)}
+    return dict(result)
+
+def _system_error(e):
+    _LOG.error("Expert system error: %s", e)
+    return {
+        'decision': 'reject',
+        'reason': f'System error: {str(e)}',
+        'complexity': 'unknown'
+    }
 
 def analyze_case(case_data):
-    """Main interface for the expert system."""
+    """Main interface for the expert system.
+
+    Decisions depend only on the documents and symptoms, so they are cached
+    on a canonical key and the case's own record id is filled in afterwards.
+    """
     try:
-        control = ControlShell()
-        return control.process_case(case_data)
-    except Exception as e:
-        logging.error(f"Expert system error: {str(e)}")
-        return {
-            'decision': 'reject',
-            'reason': f'System error: {str(e)}',
-            'complexity': 'unknown'
-        } 
\ No newline at end of file
+        facts, key = _case_key(case_data)
+    except ValueError as e:
+        return _system_error(e)
+    return _case_result(_analyze_cached(*key), facts)
+
+def analyze_cases(cases):
+    """Batch interface for the expert system, results are in input order.
+
+    Every case is validated exactly as analyze_case does, then the batch is
+    grouped by canonical key so each distinct decision is looked up once.
+    """
+    decided = {}
+    results = []
+    for case in cases:
+        try:
+            facts, key = _case_key(case)
+        except ValueError as e:
+            results.append(_system_error(e))
+            continue
+        result = decided.get(key)
+        if result is None:
+            result = decided[key] = _analyze_cached(*key)
+        results.append(_case_result(result, facts))
+    return results
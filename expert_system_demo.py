@@ -1,5 +1,5 @@
 from datetime import datetime
-from expert_system import analyze_case
+from expert_system import analyze_cases
 
 # Demo cases
 cases = [
@@ -46,8 +46,7 @@ cases = [
 ]
 
 print("=== Expert System Demo ===\n")
-for i, case in enumerate(cases, 1):
-    result = analyze_case(case)
+for i, (case, result) in enumerate(zip(cases, analyze_cases(cases)), 1):
     print(f"Case {i}:")
     print(f"  Input: {case}")
     print(f"  Output: {result}\n")
\ No newline at end of file
@@ -0,0 +1,35 @@
+import random
+import sys
+from simulation import run_simulation
+
+# Seeded runs of the SimPy engine and the fast path must give identical
+# results and leave the random module in the same state afterwards
+SEEDS = range(50)
+SCENARIOS = [
+    # (duration_hours, num_doctors, num_nurses)
+    (8, 1, 3),
+    (8.5, 1, 1),
+    (4, 2, 2),
+    (24, 1, 3)
+]
+
+def run_seeded(seed, scenario, fast):
+    random.seed(seed)
+    result = run_simulation(*scenario, fast=fast)
+    return result, random.random()
+
+print("=== Fast Path Check ===\n")
+mismatches = 0
+for scenario in SCENARIOS:
+    for seed in SEEDS:
+        simpy_result, simpy_state = run_seeded(seed, scenario, fast=False)
+        fast_result, fast_state = run_seeded(seed, scenario, fast=True)
+        if simpy_result != fast_result or simpy_state != fast_state:
+            mismatches += 1
+            differing = [key for key in simpy_result
+                         if simpy_result[key] != fast_result.get(key)]
+            print(f"Mismatch: seed {seed}, scenario {scenario}, fields {differing}")
+
+runs = len(SEEDS) * len(SCENARIOS)
+print(f"{runs - mismatches}/{runs} seeded runs identical")
+sys.exit(1 if mismatches else 0)
@@ -1,15 +1,15 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox
 import logging
-from datetime import datetime
 from predefined_cases import SIMULATION_SCENARIOS
 from simulation import run_simulation, ClinicConfig
-import ttkthemes
 import threading
-import queue
+import time
+from collections import deque
+from types import MappingProxyType
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Configure logging
@@ -35,6 +35,131 @@ SURVEY_ASSUMPTIONS = {
     'success_rate': 90,  # Example survey value for comparison
 }
 
+# Clinic configuration for the survey-based comparison run
+SURVEY_CONFIG = ClinicConfig(
+    OPENING_TIME="08:30",
+    CLOSING_TIME="17:00",
+    MAX_NURSES=SURVEY_ASSUMPTIONS['nurses'],
+    MAX_DOCTORS=SURVEY_ASSUMPTIONS['doctors'],
+    MAX_STAFF=SURVEY_ASSUMPTIONS['clinic_staff'],
+    NURSE_PROCESS_TIME=SURVEY_ASSUMPTIONS['nurse_inquiry'],
+    DOCTOR_PROCESS_TIME=SURVEY_ASSUMPTIONS['complex_case'],
+    STAFF_PROCESS_TIME=SURVEY_ASSUMPTIONS['finalization']
+)
+
+# Survey assumptions reference, appended to every statistics report
+_SURVEY_ASSUMPTIONS_TEXT = (
+    "--- Survey Assumptions Reference ---\n"
+    f"Operating Hours: {SURVEY_ASSUMPTIONS['operating_hours']}\n"
+    f"Nurses: {SURVEY_ASSUMPTIONS['nurses']}\n"
+    f"Doctors: {SURVEY_ASSUMPTIONS['doctors']}\n"
+    f"Nurse Inquiry: {SURVEY_ASSUMPTIONS['nurse_inquiry']} min\n"
+    f"Simple Case: {SURVEY_ASSUMPTIONS['simple_case']} min\n"
+    f"Complex Case: {SURVEY_ASSUMPTIONS['complex_case']} min\n"
+    f"Finalization: {SURVEY_ASSUMPTIONS['finalization']} min\n"
+    f"IT Input: {SURVEY_ASSUMPTIONS['it_input']} min\n"
+)
+
+def _format_results_block(title, results):
+    """Format one simulation's results as a statistics report section"""
+    return (
+        f"{title}\n=======================\n"
+        f"Total Patients: {results.get('total_patients', 0)}\n"
+        f"Patients Seen: {results.get('patients_seen', 0)}\n"
+        f"Certificates Issued: {results.get('certificates_issued', 0)}\n"
+        f"Average Wait Time: {results.get('average_wait_time', 0):.2f} minutes\n"
+        f"Certificate Success Rate: {results.get('certificate_issuance_rate', 0):.1f}%\n"
+        f"Cases: {results.get('simple_cases', 0)}\n"
+        f"Visits: {results.get('off_peak_visits', 0)}\n"
+        "\n"
+    )
+
+# Event queue polling interval (ms): quick while events flow, slow when idle
+QUEUE_POLL_BUSY_MS = 30
+QUEUE_POLL_IDLE_MS = 200
+
+# Backlog past which new "student" arrival events are dropped
+EVENT_QUEUE_SOFT_LIMIT = 512
+
+# Most recent events kept in the events log
+EVENT_LOG_LIMIT = 2000
+
+# Events log icon for each event category
+_CATEGORY_ICONS = MappingProxyType({
+    'NURSE': '👨‍⚕️',
+    'DOCTOR': '👩‍⚕️',
+    'SYSTEM': '⚙️',
+    'PATIENT': '🏥'
+})
+_DEFAULT_ICON = '📋'
+
+# Event stamps change once a second, so each second is formatted only once
+_EVENT_TIME_FORMAT = "%H:%M:%S"
+_last_stamp = (None, '')
+
+def _event_time():
+    """Current time as "%H:%M:%S", formatted at most once a second"""
+    global _last_stamp
+    second = int(time.time())
+    cached_second, formatted = _last_stamp
+    if second != cached_second:
+        formatted = time.strftime(_EVENT_TIME_FORMAT, time.localtime(second))
+        _last_stamp = (second, formatted)
+    return formatted
+
+# Simulation event text, already folded onto one events log row
+_YESNO = ("No", "Yes")
+_STUDENT_TITLE = "Student {}".format
+_STUDENT_DESC = "Status: {} · Excuse Letter: {} · Valid ID: {}".format
+_COMPLETION_TITLE = "Student {} Completed".format
+_COMPLETION_DESC = "Status: {} · Reason: {} · Wait Time: {:.1f} min".format
+
+# Color scheme
+_COLORS = MappingProxyType({
+    'primary': '#6C5CE7',      # Purple
+    'secondary': '#A8A5E6',    # Light Purple
+    'success': '#00B894',      # Green
+    'warning': '#FDCB6E',      # Yellow
+    'danger': '#FF7675',       # Red
+    'background': '#F8F9FA',   # Light Gray
+    'surface': '#FFFFFF',      # White
+    'text': '#2D3436'          # Dark Gray
+})
+
+# Custom ttk styles as (style name, configure options)
+_STYLE_SPEC = (
+    # Frame styles
+    ('Card.TFrame', {'background': _COLORS['background']}),
+    ('Sidebar.TFrame', {'background': _COLORS['surface']}),
+    # Label styles
+    ('CardTitle.TLabel', {'font': ('Segoe UI', 12),
+                          'foreground': _COLORS['text'],
+                          'background': _COLORS['background']}),
+    ('CardValue.TLabel', {'font': ('Segoe UI', 24, 'bold'),
+                          'foreground': _COLORS['primary'],
+                          'background': _COLORS['background']}),
+    ('CardIcon.TLabel', {'font': ('Segoe UI', 24),
+                         'foreground': _COLORS['secondary'],
+                         'background': _COLORS['background']}),
+    # Event log styles
+    ('Events.Treeview', {'font': ('Segoe UI', 10),
+                         'rowheight': 28,
+                         'foreground': _COLORS['text'],
+                         'background': _COLORS['background'],
+                         'fieldbackground': _COLORS['background']}),
+    ('Events.Treeview.Heading', {'font': ('Segoe UI', 10, 'bold')}),
+    # Button styles
+    ('Action.TButton', {'font': ('Segoe UI', 11),
+                        'background': _COLORS['primary'],
+                        'foreground': '#000000'}),
+    ('Nav.TButton', {'font': ('Segoe UI', 12, 'bold'), 'padding': 10}),
+)
+
+def _configure_app_styles(style):
+    """Register the application's custom ttk styles on style's interpreter"""
+    for name, options in _STYLE_SPEC:
+        style.configure(name, **options)
+
 class ModernFrame(ttk.Frame):
     """A custom frame with modern styling"""
     def __init__(self, *args, **kwargs):
@@ -46,103 +171,24 @@ class StatCard(ttk.Frame):
     def __init__(self, parent, title, value, icon="📊"):
         super().__init__(parent, style='Card.TFrame')
         
-        # Card layout
-        self.title = ttk.Label(self, text=title, style='CardTitle.TLabel')
-        self.title.pack(anchor='w', padx=15, pady=(15,5))
-        
-        self.value = ttk.Label(self, text=str(value), style='CardValue.TLabel')
-        self.value.pack(anchor='w', padx=15, pady=(0,15))
+        # The label redraws itself at idle whenever the variable changes
+        self._text = str(value)
+        self._var = tk.StringVar(self, value=self._text)
         
+        # Card layout: title over value on the left, icon centred on the right
+        self.title = ttk.Label(self, text=title, style='CardTitle.TLabel')
+        self.value = ttk.Label(self, textvariable=self._var, style='CardValue.TLabel')
         self.icon = ttk.Label(self, text=icon, style='CardIcon.TLabel')
-        self.icon.place(relx=0.85, rely=0.5, anchor='center')
+        self.title.grid(row=0, column=0, sticky='w', padx=15, pady=(15,5))
+        self.value.grid(row=1, column=0, sticky='w', padx=15, pady=(0,15))
+        self.icon.grid(row=0, column=1, rowspan=2, padx=15)
+        self.grid_columnconfigure(0, weight=1)
         
     def update_value(self, value):
-        self.value.config(text=str(value))
-
-class EventItem(ttk.Frame):
-    """A modern event list item"""
-    def __init__(self, parent, title, description, time, category):
-        super().__init__(parent, style='ListItem.TFrame')
-        
-        # Icon based on category
-        icons = {
-            'NURSE': '👨‍⚕️',
-            'DOCTOR': '👩‍⚕️',
-            'SYSTEM': '⚙️',
-            'PATIENT': '🏥'
-        }
-        icon = icons.get(category, '📋')
-        
-        # Layout
-        self.icon = ttk.Label(self, text=icon, style='EventIcon.TLabel')
-        self.icon.pack(side='left', padx=(15,10), pady=10)
-        
-        info_frame = ttk.Frame(self)
-        info_frame.pack(side='left', fill='x', expand=True, pady=10)
-        
-        ttk.Label(info_frame, text=title, style='EventTitle.TLabel').pack(anchor='w')
-        if description:
-            ttk.Label(info_frame, text=description, style='EventDesc.TLabel').pack(anchor='w')
-        
-        ttk.Label(self, text=time, style='EventTime.TLabel').pack(side='right', padx=15)
-
-    def configure_styles(self):
-        # Color scheme
-        colors = {
-            'primary': '#6C5CE7',      # Purple
-            'secondary': '#A8A5E6',    # Light Purple
-            'success': '#00B894',      # Green
-            'warning': '#FDCB6E',      # Yellow
-            'danger': '#FF7675',       # Red
-            'background': '#F8F9FA',   # Light Gray
-            'surface': '#FFFFFF',      # White
-            'text': '#2D3436'          # Dark Gray
-        }
-        
-        # Configure styles
-        self.style = ttk.Style()
-        
-        # Frame styles
-        self.style.configure('Card.TFrame', background=colors['background'])
-        self.style.configure('ListItem.TFrame', background=colors['background'])
-        self.style.configure('Sidebar.TFrame', background=colors['surface'])
-        self.style.configure('Tab.TFrame', background=colors['background'])
-        
-        # Label styles
-        self.style.configure('CardTitle.TLabel',
-                           font=('Segoe UI', 12),
-                           foreground=colors['text'],
-                           background=colors['background'])
-        self.style.configure('CardValue.TLabel',
-                           font=('Segoe UI', 24, 'bold'),
-                           foreground=colors['primary'],
-                           background=colors['background'])
-        self.style.configure('CardIcon.TLabel',
-                           font=('Segoe UI', 24),
-                           foreground=colors['secondary'],
-                           background=colors['background'])
-        self.style.configure('EventTitle.TLabel',
-                           font=('Segoe UI', 11, 'bold'),
-                           foreground=colors['text'],
-                           background=colors['background'])
-        self.style.configure('EventDesc.TLabel',
-                           font=('Segoe UI', 10),
-                           foreground=colors['secondary'],
-                           background=colors['background'])
-        self.style.configure('EventTime.TLabel',
-                           font=('Segoe UI', 10),
-                           foreground=colors['secondary'],
-                           background=colors['background'])
-        self.style.configure('EventIcon.TLabel',
-                           font=('Segoe UI', 16),
-                           foreground=colors['primary'],
-                           background=colors['background'])
-        
-        # Tab styles
-        self.style.configure('TNotebook.Tab', padding=[12, 8], font=('Segoe UI', 10))
-        self.style.map('TNotebook.Tab',
-                      background=[('selected', colors['surface'])],
-                      foreground=[('selected', colors['primary'])])
+        text = str(value)
+        if text != self._text:
+            self._text = text
+            self._var.set(text)
 
 class MedicalCertificateSystem:
     def __init__(self, root):
@@ -151,15 +197,19 @@ class MedicalCertificateSystem:
         self.root.geometry("1200x800")
         
         # Event queue for real-time updates
-        self.event_queue = queue.Queue()
+        self.event_queue = deque()
+        self._post = self.event_queue.append
         self.is_simulating = False
+        # The survey-based run has fixed parameters; it is simulated once
+        self._survey_cache = None
         
-        # Apply modern theme
+        # Apply modern theme (ttkthemes is only needed once a window exists)
+        import ttkthemes
         self.style = ttkthemes.ThemedStyle(self.root)
         self.style.set_theme("arc")
         
         # Configure custom styles
-        self.configure_styles()
+        _configure_app_styles(self.style)
         
         # Create main layout
         self.create_main_layout()
@@ -173,66 +223,6 @@ class MedicalCertificateSystem:
         self.avg_waiting_time = 0.0
         self.success_rate = 0.0
 
-    def configure_styles(self):
-        # Color scheme
-        colors = {
-            'primary': '#6C5CE7',      # Purple
-            'secondary': '#A8A5E6',    # Light Purple
-            'success': '#00B894',      # Green
-            'warning': '#FDCB6E',      # Yellow
-            'danger': '#FF7675',       # Red
-            'background': '#F8F9FA',   # Light Gray
-            'surface': '#FFFFFF',      # White
-            'text': '#2D3436'          # Dark Gray
-        }
-        
-        # Configure styles
-        self.style = ttk.Style()
-        
-        # Frame styles
-        self.style.configure('Card.TFrame', background=colors['background'])
-        self.style.configure('ListItem.TFrame', background=colors['background'])
-        self.style.configure('Sidebar.TFrame', background=colors['surface'])
-        self.style.configure('Tab.TFrame', background=colors['background'])
-        
-        # Label styles
-        self.style.configure('CardTitle.TLabel',
-                           font=('Segoe UI', 12),
-                           foreground=colors['text'],
-                           background=colors['background'])
-        self.style.configure('CardValue.TLabel',
-                           font=('Segoe UI', 24, 'bold'),
-                           foreground=colors['primary'],
-                           background=colors['background'])
-        self.style.configure('CardIcon.TLabel',
-                           font=('Segoe UI', 24),
-                           foreground=colors['secondary'],
-                           background=colors['background'])
-        self.style.configure('EventTitle.TLabel',
-                           font=('Segoe UI', 11, 'bold'),
-                           foreground=colors['text'],
-                           background=colors['background'])
-        self.style.configure('EventDesc.TLabel',
-                           font=('Segoe UI', 10),
-                           foreground=colors['secondary'],
-                           background=colors['background'])
-        self.style.configure('EventTime.TLabel',
-                           font=('Segoe UI', 10),
-                           foreground=colors['secondary'],
-                           background=colors['background'])
-        self.style.configure('EventIcon.TLabel',
-                           font=('Segoe UI', 16),
-                           foreground=colors['primary'],
-                           background=colors['background'])
-        
-        # Button styles
-        self.style.configure('Action.TButton',
-                           font=('Segoe UI', 11),
-                           background=colors['primary'],
-                           foreground='#000000')
-        # Navigation button style
-        self.style.configure('Nav.TButton', font=('Segoe UI', 12, 'bold'), padding=10)
-
     def create_main_layout(self):
         # Main container with padding
         self.main_container = ttk.Frame(self.root, padding="20")
@@ -259,6 +249,13 @@ class MedicalCertificateSystem:
         for i, card in enumerate(self.stat_cards.values()):
             card.grid(row=0, column=i, padx=5, sticky='nsew')
         stats_frame.grid_columnconfigure((0,1,2,3), weight=1)
+        # (stats key, formatter, card setter) for every stats update, bound once
+        self._card_spec = (
+            ('Patients in System', str, self.stat_cards['current_patients'].update_value),
+            ('Average Wait', "{:.1f} min".format, self.stat_cards['waiting_time'].update_value),
+            ('Certificates Issued', str, self.stat_cards['certificates'].update_value),
+            ('Success Rate', "{:.1f}%".format, self.stat_cards['success_rate'].update_value),
+        )
 
         # Simulation controls row (below stat cards)
         self.sim_controls_frame = ttk.Frame(self.content)
@@ -269,11 +266,16 @@ class MedicalCertificateSystem:
         self.tab_content_frame = ttk.Frame(self.content)
         self.tab_content_frame.pack(fill='both', expand=True)
 
-        # Create all tab frames but only show one at a time
+        # Only one tab is shown at a time; all but the events tab are built
+        # the first time they are needed
         self.tabs = {
             'events': self.create_events_tab(self.tab_content_frame),
-            'statistics': self.create_statistics_tab(self.tab_content_frame),
-            'graphs': self.create_graphs_tab(self.tab_content_frame)
+            'statistics': None,
+            'graphs': None
+        }
+        self._tab_builders = {
+            'statistics': self.create_statistics_tab,
+            'graphs': self.create_graphs_tab
         }
         self.show_tab('events')
 
@@ -324,16 +326,35 @@ class MedicalCertificateSystem:
 
     def create_events_tab(self, parent):
         frame = ttk.Frame(parent)
-        # Events list with scrollbar
-        self.events_canvas = tk.Canvas(frame, background='#F8F9FA', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.events_canvas.yview)
-        self.events_list = ttk.Frame(self.events_canvas, style='Tab.TFrame')
-        self.events_canvas.configure(yscrollcommand=scrollbar.set)
+        # Events log; Treeview only draws the rows that are on screen
+        self.events_tree = ttk.Treeview(
+            frame,
+            columns=('icon', 'title', 'description', 'time'),
+            show='headings',
+            style='Events.Treeview'
+        )
+        self.events_tree.heading('icon', text='')
+        self.events_tree.heading('title', text='Event', anchor='w')
+        self.events_tree.heading('description', text='Details', anchor='w')
+        self.events_tree.heading('time', text='Time', anchor='w')
+        self.events_tree.column('icon', width=40, stretch=False, anchor='center')
+        self.events_tree.column('title', width=200, stretch=False)
+        self.events_tree.column('description', width=400)
+        self.events_tree.column('time', width=90, stretch=False)
+        # Rows are tagged with their category and coloured per tag
+        self.events_tree.tag_configure('PATIENT', foreground=_COLORS['primary'])
+        self.events_tree.tag_configure('NURSE', foreground=_COLORS['success'])
+        self.events_tree.tag_configure('DOCTOR', foreground=_COLORS['success'])
+        self.events_tree.tag_configure('SYSTEM', foreground=_COLORS['text'])
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.events_tree.yview)
+        self.events_tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
-        self.events_canvas.pack(side="left", fill="both", expand=True)
-        self.events_canvas.create_window((0, 0), window=self.events_list, anchor="nw")
-        self.events_list.bind("<Configure>", self._on_frame_configure)
-        self.events_canvas.bind('<Configure>', self._on_canvas_configure)
+        self.events_tree.pack(side="left", fill="both", expand=True)
+        # Row ids in insertion order; the oldest row is dropped past the cap
+        self._event_ids = deque(maxlen=EVENT_LOG_LIMIT)
+        self._scroll_pending = False
+        # Events raised while another tab is showing; drawn on return
+        self._pending_events = deque(maxlen=EVENT_LOG_LIMIT)
         return frame
 
     def create_statistics_tab(self, parent):
@@ -343,17 +364,66 @@ class MedicalCertificateSystem:
 
     def create_graphs_tab(self, parent):
         frame = ttk.Frame(parent)
-        self.graph_canvas = None
         self.graph_frame = ttk.Frame(frame)
         self.graph_frame.pack(fill='both', expand=True)
+        # The comparison chart is built once; refreshes only change the bar
+        # heights and blit the axes over a cached background
+        labels = ['Total Patients', 'Certificates Issued', 'Avg. Wait Time (min)', 'Success Rate (%)']
+        x = range(len(labels))
+        self.graph_fig = Figure(figsize=(7,4))
+        self.graph_ax = self.graph_fig.add_subplot()
+        ax = self.graph_ax
+        self.sim_bars = ax.bar([i-0.2 for i in x], [0] * len(labels), width=0.4,
+                               label='Agent-Based', color=_COLORS['primary'], animated=True)
+        self.survey_bars = ax.bar([i+0.2 for i in x], [0] * len(labels), width=0.4,
+                                  label='Survey-Based', color=_COLORS['success'], animated=True)
+        ax.set_xticks(list(x))
+        ax.set_xticklabels(labels)
+        ax.set_ylim(0, 1)
+        ax.legend()
+        ax.set_title('Agent-Based vs Survey-Based Simulation Comparison')
+        self.graph_fig.tight_layout()
+        self.graph_canvas = FigureCanvasTkAgg(self.graph_fig, master=self.graph_frame)
+        self.graph_canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._graph_bg = None
+        self.graph_canvas.mpl_connect('draw_event', self._on_graph_draw)
+        self.graph_canvas.draw()
+        return frame
+
+    def _on_graph_draw(self, event):
+        """Re-capture the static background after every full redraw"""
+        self._graph_bg = self.graph_canvas.copy_from_bbox(self.graph_ax.bbox)
+        self._draw_graph_bars()
+
+    def _draw_graph_bars(self):
+        """Draw the animated bars over the cached background"""
+        ax = self.graph_ax
+        for bar in self.sim_bars:
+            ax.draw_artist(bar)
+        for bar in self.survey_bars:
+            ax.draw_artist(bar)
+        self.graph_canvas.blit(ax.bbox)
+
+    def _get_tab(self, tab_name):
+        """Return a tab's frame, building it on first use"""
+        frame = self.tabs[tab_name]
+        if frame is None:
+            frame = self.tabs[tab_name] = self._tab_builders[tab_name](self.tab_content_frame)
         return frame
 
     def show_tab(self, tab_name):
         for name, frame in self.tabs.items():
-            frame.pack_forget()
-        self.tabs[tab_name].pack(fill='both', expand=True)
+            if frame is not None:
+                frame.pack_forget()
+        self._get_tab(tab_name).pack(fill='both', expand=True)
+        self.current_tab = tab_name
+        if tab_name == 'events':
+            while self._pending_events:
+                self._insert_event(*self._pending_events.popleft())
 
     def create_statistics_sections_in_tab(self, parent):
+        from tkinter import scrolledtext
+        
         # Main statistics text
         self.stats_text = scrolledtext.ScrolledText(parent, height=15, width=70)
         self.stats_text.pack(fill='both', expand=True, pady=(0, 10))
@@ -377,29 +447,18 @@ class MedicalCertificateSystem:
         self.peak_labels['peak'].pack(side='left', padx=10)
         self.peak_labels['off_peak'].pack(side='left', padx=10)
 
-    def _on_frame_configure(self, event=None):
-        """Reset the scroll region to encompass the inner frame"""
-        self.events_canvas.configure(scrollregion=self.events_canvas.bbox("all"))
-
-    def _on_canvas_configure(self, event):
-        """When the canvas is resized, resize the inner frame to match"""
-        width = event.width
-        self.events_canvas.itemconfig(self.events_canvas.find_withtag('all')[0], width=width)
-
-    def handle_simulation_event(self, event_type, data):
-        """Handle events from the simulation."""
+    def handle_simulation_event(self, event_type, data, time):
+        """Handle events from the simulation, stamped with their post time."""
         try:
             if event_type == "student":
-                # Create detailed event description
-                description = (
-                    f"Status: {data.get('action', 'unknown')}\n"
-                    f"Excuse Letter: {'Yes' if data.get('has_excuse_letter') else 'No'}\n"
-                    f"Valid ID: {'Yes' if data.get('has_valid_id') else 'No'}"
-                )
                 self.add_event(
-                    f"Student {data['id']}", 
-                    description,
-                    datetime.now().strftime("%H:%M:%S"),
+                    _STUDENT_TITLE(data['id']),
+                    _STUDENT_DESC(
+                        data.get('action', 'unknown'),
+                        _YESNO[bool(data.get('has_excuse_letter'))],
+                        _YESNO[bool(data.get('has_valid_id'))]
+                    ),
+                    time,
                     "PATIENT"
                 )
                 
@@ -407,15 +466,14 @@ class MedicalCertificateSystem:
                 self._update_stat_cards(data)
                 
             elif event_type == "completion":
-                description = (
-                    f"Status: {data.get('status', 'unknown')}\n"
-                    f"Reason: {data.get('reason', 'N/A')}\n"
-                    f"Wait Time: {data.get('wait_time', 0):.1f} min"
-                )
                 self.add_event(
-                    f"Student {data['id']} Completed",
-                    description,
-                    datetime.now().strftime("%H:%M:%S"),
+                    _COMPLETION_TITLE(data['id']),
+                    _COMPLETION_DESC(
+                        data.get('status', 'unknown'),
+                        data.get('reason', 'N/A'),
+                        data.get('wait_time', 0)
+                    ),
+                    time,
                     "SYSTEM"
                 )
                 
@@ -424,37 +482,44 @@ class MedicalCertificateSystem:
             self.add_event(
                 "System Error",
                 str(e),
-                datetime.now().strftime("%H:%M:%S"),
+                time,
                 "SYSTEM"
             )
 
     def _update_stat_cards(self, data):
         """Safely update statistics cards with new data"""
         try:
-            # Update current patients
-            if 'Patients in System' in data:
-                self.stat_cards['current_patients'].update_value(str(data['Patients in System']))
-            
-            # Update waiting time
-            if 'Average Wait' in data:
-                wait_mins = f"{data['Average Wait']:.1f}"
-                self.stat_cards['waiting_time'].update_value(f"{wait_mins} min")
-            
-            # Update certificates
-            if 'Certificates Issued' in data:
-                self.stat_cards['certificates'].update_value(str(data['Certificates Issued']))
-            
-            # Update success rate
-            if 'Success Rate' in data:
-                self.stat_cards['success_rate'].update_value(f"{data['Success Rate']:.1f}%")
+            # StatCard.update_value skips text that is already shown
+            for key, fmt, set_value in self._card_spec:
+                value = data.get(key)
+                if value is not None:
+                    set_value(fmt(value))
         except Exception as e:
             logging.error(f"Error updating statistics cards: {str(e)}")
 
+    def post_simulation_event(self, event_type, data):
+        """Queue a simulation event for the Tk thread (simulation callback).
+
+        Events are stamped here, on the producer side, so the Tk thread
+        only renders them. When the Tk thread has fallen behind, arrival
+        events are dropped; outcomes, stats and results are always kept.
+        """
+        if event_type == "student" and len(self.event_queue) >= EVENT_QUEUE_SOFT_LIMIT:
+            return
+        self._post((event_type, data, _event_time()))
+
     def process_queue(self):
         """Process events from the queue and update the GUI."""
+        latest_stats = {}
+        pending = len(self.event_queue)
         try:
-            while True:
-                event_type, data = self.event_queue.get_nowait()
+            # Single producer (simulation thread), single consumer (Tk
+            # thread): deque append/popleft are atomic, no locking needed.
+            # Drain only what was queued at entry so a busy simulation
+            # cannot keep this tick from returning to the Tk event loop.
+            popleft = self.event_queue.popleft
+            for _ in range(pending):
+                event_type, data, time = popleft()
                 
                 if event_type == "log":
                     self.add_event(
@@ -463,17 +528,23 @@ class MedicalCertificateSystem:
                         category=data.get('category', 'SYSTEM')
                     )
                 elif event_type == "stats":
-                    for card_name, value in data.items():
-                        if card_name in self.stat_cards:
-                            self.stat_cards[card_name].update_value(value)
+                    # Only the newest value per card in a batch is worth drawing
+                    latest_stats.update(data)
                 elif event_type == "status":
-                    self.add_event("Status Update", data, category="SYSTEM")
+                    self.add_event("Status Update", data, time, "SYSTEM")
+                elif event_type == "results":
+                    self.show_simulation_results(*data)
+                elif event_type == "error":
+                    messagebox.showerror(*data)
+                else:
+                    self.handle_simulation_event(event_type, data, time)
                 
-        except queue.Empty:
-            pass
         finally:
+            if latest_stats:
+                self._update_stat_cards(latest_stats)
             # Schedule the next queue check
-            self.root.after(100, self.process_queue)
+            interval = QUEUE_POLL_BUSY_MS if pending else QUEUE_POLL_IDLE_MS
+            self.root.after(interval, self.process_queue)
 
     def run_simulation(self):
         """Run the simulation with real-time updates."""
@@ -492,8 +563,9 @@ class MedicalCertificateSystem:
             finalization = int(self.finalization_var.get())
 
             # Clear previous events
-            for widget in self.events_list.winfo_children():
-                widget.destroy()
+            self.events_tree.delete(*self.events_tree.get_children())
+            self._event_ids.clear()
+            self._pending_events.clear()
 
             # Reset statistics
             for card in self.stat_cards.values():
@@ -536,59 +608,40 @@ class MedicalCertificateSystem:
                 duration_hours=duration,
                 num_doctors=num_doctors,
                 num_nurses=num_nurses,
-                event_callback=self.handle_simulation_event,
+                event_callback=self.post_simulation_event,
                 config=custom_config
             )
-            # Update final results
-            self.root.after(0, self.show_simulation_results, results)
+            # Run the survey-based comparison here too, so the Tk thread
+            # only has to display finished results
+            survey_results = None if 'error' in results else self.run_survey_simulation()
+            # Hand final results to the Tk thread through the event queue
+            self.post_simulation_event("results", (results, survey_results))
         except Exception as e:
-            self.root.after(0, messagebox.showerror, "Error", f"Simulation error: {str(e)}")
+            self.post_simulation_event("error", ("Error", f"Simulation error: {str(e)}"))
         finally:
             self.is_simulating = False
-            self.event_queue.put(("status", "Completed"))
+            self.post_simulation_event("status", "Completed")
 
-    def show_simulation_results(self, results):
-        """Display final simulation results."""
+    def show_simulation_results(self, results, survey_results):
+        """Display final simulation results next to the survey-based run."""
         try:
             if 'error' in results:
                 messagebox.showerror("Simulation Error", results['error'])
                 return
 
-            # Run survey-based simulation for comparison
-            survey_results = self.run_survey_simulation()
+            # Results go to both tabs, so make sure they exist
+            self._get_tab('statistics')
+            self._get_tab('graphs')
 
-            # Update statistics text
+            # Update statistics text in a single insert
+            report = (
+                _format_results_block("Agent-Based Simulation", results)
+                + _format_results_block("Survey-Based Simulation", survey_results)
+                + _SURVEY_ASSUMPTIONS_TEXT
+            )
             self.stats_text.config(state=tk.NORMAL)
             self.stats_text.delete(1.0, tk.END)
-
-            # User simulation block
-            self.stats_text.insert(tk.END, "Agent-Based Simulation\n=======================\n")
-            self.stats_text.insert(tk.END, f"Total Patients: {results.get('total_patients', 0)}\n")
-            self.stats_text.insert(tk.END, f"Patients Seen: {results.get('patients_seen', 0)}\n")
-            self.stats_text.insert(tk.END, f"Certificates Issued: {results.get('certificates_issued', 0)}\n")
-            self.stats_text.insert(tk.END, f"Average Wait Time: {results.get('average_wait_time', 0):.2f} minutes\n")
-            self.stats_text.insert(tk.END, f"Certificate Success Rate: {results.get('certificate_issuance_rate', 0):.1f}%\n")
-            self.stats_text.insert(tk.END, f"Cases: {results.get('simple_cases', 0)}\n")
-            self.stats_text.insert(tk.END, f"Visits: {results.get('off_peak_visits', 0)}\n")
-            self.stats_text.insert(tk.END, "\n")
-
-            # Survey simulation block
-            self.stats_text.insert(tk.END, "Survey-Based Simulation\n=======================\n")
-            self.stats_text.insert(tk.END, f"Total Patients: {survey_results.get('total_patients', 0)}\n")
-            self.stats_text.insert(tk.END, f"Patients Seen: {survey_results.get('patients_seen', 0)}\n")
-            self.stats_text.insert(tk.END, f"Certificates Issued: {survey_results.get('certificates_issued', 0)}\n")
-            self.stats_text.insert(tk.END, f"Average Wait Time: {survey_results.get('average_wait_time', 0):.2f} minutes\n")
-            self.stats_text.insert(tk.END, f"Certificate Success Rate: {survey_results.get('certificate_issuance_rate', 0):.1f}%\n")
-            self.stats_text.insert(tk.END, f"Cases: {survey_results.get('simple_cases', 0)}\n")
-            self.stats_text.insert(tk.END, f"Visits: {survey_results.get('off_peak_visits', 0)}\n")
-            self.stats_text.insert(tk.END, "\n")
-
-            # Add comparison to survey assumptions (for reference)
-            self.stats_text.insert(tk.END, "--- Survey Assumptions Reference ---\n")
-            self.stats_text.insert(tk.END, f"Operating Hours: {SURVEY_ASSUMPTIONS['operating_hours']}\n")
-            self.stats_text.insert(tk.END, f"Nurses: {SURVEY_ASSUMPTIONS['nurses']}\n")
-            self.stats_text.insert(tk.END, f"Doctors: {SURVEY_ASSUMPTIONS['doctors']}\n")
-            self.stats_text.insert(tk.END, f"Nurse Inquiry: {SURVEY_ASSUMPTIONS['nurse_inquiry']} min\nSimple Case: {SURVEY_ASSUMPTIONS['simple_case']} min\nComplex Case: {SURVEY_ASSUMPTIONS['complex_case']} min\nFinalization: {SURVEY_ASSUMPTIONS['finalization']} min\nIT Input: {SURVEY_ASSUMPTIONS['it_input']} min\n")
+            self.stats_text.insert(tk.END, report)
             self.stats_text.config(state=tk.DISABLED)
 
             # Update complexity labels
@@ -620,24 +673,19 @@ class MedicalCertificateSystem:
             messagebox.showerror("Error", f"Failed to display simulation results: {str(e)}")
 
     def run_survey_simulation(self):
-        # Use survey-based parameters
-        survey_config = ClinicConfig(
-            OPENING_TIME="08:30",
-            CLOSING_TIME="17:00",
-            MAX_NURSES=3,
-            MAX_DOCTORS=1,
-            MAX_STAFF=1,
-            NURSE_PROCESS_TIME=5,   # Nurse Inquiry
-            DOCTOR_PROCESS_TIME=10, # Complex Case
-            STAFF_PROCESS_TIME=2    # Certificate Finalization
-        )
+        if self._survey_cache is not None:
+            return self._survey_cache
         # Duration: 510 minutes = 8.5 hours
-        return run_simulation(duration_hours=8.5, num_doctors=1, num_nurses=3, event_callback=None)
+        results = run_simulation(duration_hours=8.5,
+                                 num_doctors=SURVEY_CONFIG.MAX_DOCTORS,
+                                 num_nurses=SURVEY_CONFIG.MAX_NURSES,
+                                 event_callback=None, config=SURVEY_CONFIG,
+                                 fast=True)
+        if 'error' not in results:
+            self._survey_cache = results
+        return results
 
     def update_graphs_tab(self, results, survey_results=None):
-        # Remove previous graph if exists
-        for widget in self.graph_frame.winfo_children():
-            widget.destroy()
         # Prepare data for comparison
         sim_total_patients = results.get('total_patients', 0)
         sim_cert_issued = results.get('certificates_issued', 0)
@@ -653,37 +701,44 @@ class MedicalCertificateSystem:
             survey_cert_issued = SURVEY_ASSUMPTIONS.get('certificates_issued', 0)
             survey_wait = SURVEY_ASSUMPTIONS['avg_wait_time']
             survey_rate = SURVEY_ASSUMPTIONS['success_rate']
-        labels = ['Total Patients', 'Certificates Issued', 'Avg. Wait Time (min)', 'Success Rate (%)']
         sim_values = [sim_total_patients, sim_cert_issued, sim_wait, sim_rate]
         survey_values = [survey_total_patients, survey_cert_issued, survey_wait, survey_rate]
-        x = range(len(labels))
-        fig, ax = plt.subplots(figsize=(7,4))
-        ax.bar([i-0.2 for i in x], sim_values, width=0.4, label='Agent-Based', color='#6C5CE7')
-        ax.bar([i+0.2 for i in x], survey_values, width=0.4, label='Survey-Based', color='#00B894')
-        ax.set_xticks(list(x))
-        ax.set_xticklabels(labels)
-        ax.legend()
-        ax.set_title('Agent-Based vs Survey-Based Simulation Comparison')
-        fig.tight_layout()
-        self.graph_canvas = FigureCanvasTkAgg(fig, master=self.graph_frame)
-        self.graph_canvas.draw()
-        self.graph_canvas.get_tk_widget().pack(fill='both', expand=True)
+        for bar, value in zip(self.sim_bars, sim_values):
+            bar.set_height(value)
+        for bar, value in zip(self.survey_bars, survey_values):
+            bar.set_height(value)
+
+        # Only a change of scale needs the axes redrawn; the draw_event
+        # handler then re-captures the background and draws the bars.
+        # draw_idle coalesces back-to-back refreshes into one repaint, and
+        # the stale background is dropped so nothing blits over it meanwhile.
+        top = max(max(sim_values), max(survey_values), 1) * 1.1
+        ymax = self.graph_ax.get_ylim()[1]
+        if top > ymax or top < ymax / 2:
+            self.graph_ax.set_ylim(0, top)
+            self._graph_bg = None
+            self.graph_canvas.draw_idle()
+        elif self._graph_bg is not None:
+            self.graph_canvas.restore_region(self._graph_bg)
+            self._draw_graph_bars()
 
     def reset_statistics(self):
         """Reset all statistics and clear events."""
         try:
             # Clear events list
-            for widget in self.events_list.winfo_children():
-                widget.destroy()
+            self.events_tree.delete(*self.events_tree.get_children())
+            self._event_ids.clear()
+            self._pending_events.clear()
             
             # Reset stat cards
             for card in self.stat_cards.values():
                 card.update_value("0")
             
-            # Clear statistics text
-            self.stats_text.config(state=tk.NORMAL)
-            self.stats_text.delete(1.0, tk.END)
-            self.stats_text.config(state=tk.DISABLED)
+            # Clear statistics text (nothing to clear if never built)
+            if self.tabs['statistics'] is not None:
+                self.stats_text.config(state=tk.NORMAL)
+                self.stats_text.delete(1.0, tk.END)
+                self.stats_text.config(state=tk.DISABLED)
             
             # Add reset event
             self.add_event("Statistics Reset", "All statistics have been cleared", category="SYSTEM")
@@ -693,43 +748,42 @@ class MedicalCertificateSystem:
 
     def add_event(self, title, description="", time=None, category="SYSTEM"):
         """Add a new event to the events list."""
+        if time is None:
+            time = _event_time()
+        
+        # Nobody is looking at the log; keep the event and draw it later
+        if self.current_tab != 'events':
+            self._pending_events.append((title, description, time, category))
+            return
+        self._insert_event(title, description, time, category)
+
+    def _insert_event(self, title, description, time, category):
+        """Append one row to the events log."""
         try:
-            if time is None:
-                time = datetime.now().strftime("%H:%M:%S")
+            icon = _CATEGORY_ICONS.get(category, _DEFAULT_ICON)
+            
+            # Rows are single-line, so fold multi-line details onto one
+            item = self.events_tree.insert('', 'end', values=(
+                icon, title, description.replace('\n', ' · '), time
+            ), tags=(category,))
             
-            # Create new event item
-            event = EventItem(self.events_list, title, description, time, category)
-            event.pack(fill='x', pady=1)
+            if len(self._event_ids) == self._event_ids.maxlen:
+                self.events_tree.delete(self._event_ids[0])
+            self._event_ids.append(item)
             
-            # Auto-scroll to bottom
-            self.events_canvas.yview_moveto(1.0)
+            # Auto-scroll to bottom once the current burst has been drawn
+            if not self._scroll_pending:
+                self._scroll_pending = True
+                self.root.after_idle(self._flush_scroll)
             
         except Exception as e:
             logging.error(f"Error adding event: {str(e)}")
-            # Try to add error event without fancy formatting
-            try:
-                ttk.Label(self.events_list, text=f"Error: {str(e)}").pack(fill='x')
-            except:
-                pass
-        finally:
-            # Always update scroll region
-            try:
-                self._on_frame_configure()
-            except Exception as e:
-                logging.error(f"Error updating scroll region: {str(e)}")
-
-    def update_statistics(self, stats):
-        """Update the statistics display with new values."""
-        if 'current_patients' in stats:
-            self.stats_values[0].config(text=str(stats['current_patients']))
-        if 'avg_waiting_time' in stats:
-            formatted_time = f"{stats['avg_waiting_time']:.1f} min"
-            self.stats_values[1].config(text=formatted_time)
-        if 'certificates' in stats:
-            self.stats_values[2].config(text=str(stats['certificates']))
-        if 'success_rate' in stats:
-            formatted_rate = f"{stats['success_rate']:.1f}%"
-            self.stats_values[3].config(text=formatted_rate)
+
+    def _flush_scroll(self):
+        """Bring the newest event into view"""
+        self._scroll_pending = False
+        if self._event_ids:
+            self.events_tree.see(self._event_ids[-1])
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -272,4 +272,13 @@ SIMULATION_SCENARIOS = {
             }
         }
     }
-} 
\ No newline at end of file
+}
+
+# Case lists are fixed at import: store them as tuples and index the cases
+# by symptom and by severity so lookups need no scan over TYPICAL_CASES
+def _freeze_case_lists():
+    for case in TYPICAL_CASES.values():
+        case["symptoms"] = tuple(case["symptoms"])
+        case["documentation_required"] = tuple(case["documentation_required"])
+
+_freeze_case_lists()
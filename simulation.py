@@ -1,10 +1,23 @@
 import simpy
 import random
 import logging
+import heapq
+from collections import deque
+from itertools import count, repeat
+import numpy as np
 from datetime import datetime, timedelta
 from expert_system import analyze_case
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+SIMPLE_SYMPTOMS = (
+    'cold', 'flu', 'cough', 'headache', 
+    'fever', 'stomach ache', 'sore throat'
+)
+COMPLEX_SYMPTOMS = (
+    'recurring fever', 'severe injury', 'chronic pain',
+    'mental health issues', 'surgery recovery', 'infectious disease'
+)
 
 @dataclass
 class ClinicConfig:
@@ -17,69 +30,136 @@ class ClinicConfig:
     NURSE_PROCESS_TIME: int = 10  # minutes
     DOCTOR_PROCESS_TIME: int = 15  # minutes
     STAFF_PROCESS_TIME: int = 5   # minutes
+    RANDOM_BATCH_SIZE: int = 128  # students/arrivals drawn per NumPy batch; 0 disables
+    STATS_EVERY: int = 16  # completions per "stats" notification; 1 sends every one
+
+def _seeded_rng() -> np.random.Generator:
+    """NumPy generator seeded from the random module, so random.seed() still reproduces a run"""
+    return np.random.default_rng(random.getrandbits(64))
+
+class _Refilling:
+    """Values from draw(rng, n), drawn batch_size at a time as they run out"""
+    def __init__(self, rng: np.random.Generator, batch_size: int, draw):
+        self._rng = rng
+        self.batch_size = batch_size
+        self._draw = draw
+        self._values = iter(())
+
+    def next(self):
+        value = next(self._values, None)
+        if value is None:
+            self._values = iter(self._draw(self._rng, self.batch_size))
+            value = next(self._values)
+        return value
+
+def _uniform(low: float, high: float):
+    """Batch draw for _Refilling: n floats uniform in [low, high)"""
+    return lambda rng, n: rng.uniform(low, high, n).tolist()
+
+def _student_rows(rng: np.random.Generator, n: int):
+    """Batch draw for _Refilling: n students with the same odds as Student's own draws"""
+    # Case timestamps are a wall-clock tag; one reading serves the batch
+    timestamp = datetime.now()
+    has_excuse = rng.random(n) > 0.2
+    has_valid_id = has_excuse & (rng.random(n) > 0.1)
+    is_simple = rng.random(n) < 0.7
+    num_simple = np.where(is_simple, rng.integers(1, 4, n), rng.integers(0, 3, n))
+    num_complex = np.where(is_simple, 0, rng.integers(1, 3, n))
+    # Sampling without replacement: the leading entries of a random order
+    simple_order = rng.random((n, len(SIMPLE_SYMPTOMS))).argsort(axis=1)
+    complex_order = rng.random((n, len(COMPLEX_SYMPTOMS))).argsort(axis=1)
+    return zip(
+        has_excuse.tolist(), has_valid_id.tolist(),
+        num_simple.tolist(), num_complex.tolist(),
+        simple_order.tolist(), complex_order.tolist(),
+        repeat(timestamp)
+    )
+
+class StudentDraws:
+    """Random student attributes, generated in NumPy batches"""
+    def __init__(self, batch_size: int):
+        self._rows = _Refilling(_seeded_rng(), batch_size, _student_rows)
+
+    def next(self) -> Tuple[bool, bool, List[str], datetime]:
+        """Return (has_excuse_letter, has_valid_id, symptoms, timestamp) for one student"""
+        (has_excuse, has_valid_id, num_simple, num_complex,
+         simple_order, complex_order, timestamp) = self._rows.next()
+        symptoms = [SIMPLE_SYMPTOMS[i] for i in simple_order[:num_simple]]
+        symptoms.extend(COMPLEX_SYMPTOMS[i] for i in complex_order[:num_complex])
+        return has_excuse, has_valid_id, symptoms, timestamp
+
+class ArrivalDraws:
+    """Inter-arrival times, generated in NumPy batches per period"""
+    def __init__(self, batch_size: int):
+        rng = _seeded_rng()
+        # One student every 5-10 minutes at peak, every 15-25 minutes otherwise
+        self.peak = _Refilling(rng, batch_size, _uniform(5, 10))
+        self.off_peak = _Refilling(rng, batch_size, _uniform(15, 25))
 
 class Student:
     """Represents a student requesting a medical certificate"""
-    def __init__(self, id: int, arrival_time: float):
+    __slots__ = ('id', 'arrival_time', 'has_excuse_letter', 'has_valid_id',
+                 'case_details', 'wait_start', 'nurse_start', 'doctor_start',
+                 'completion')
+
+    def __init__(self, id: int, arrival_time: float,
+                 draws: Optional[Tuple[bool, bool, List[str], datetime]] = None):
         self.id = id
         self.arrival_time = arrival_time
-        # 80% have excuse letters, 90% of those have valid IDs
-        self.has_excuse_letter = random.random() > 0.2
-        self.has_valid_id = random.random() > 0.1 if self.has_excuse_letter else False
-        self.case_details = self._generate_case()
-        self.process_times = {
-            'wait_start': 0,
-            'nurse_start': 0,
-            'doctor_start': 0,
-            'completion': 0
-        }
+        if draws is None:
+            # 80% have excuse letters, 90% of those have valid IDs
+            self.has_excuse_letter = random.random() > 0.2
+            self.has_valid_id = random.random() > 0.1 if self.has_excuse_letter else False
+            self.case_details = self._generate_case()
+        else:
+            self.has_excuse_letter, self.has_valid_id, symptoms, timestamp = draws
+            self.case_details = self._generate_case(symptoms, timestamp)
+        # Process timestamps (simulation minutes)
+        self.wait_start = 0
+        self.nurse_start = 0
+        self.doctor_start = 0
+        self.completion = 0
 
-    def _generate_case(self) -> Dict[str, Any]:
+    def _generate_case(self, symptoms: Optional[List[str]] = None,
+                       timestamp: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate a random case for the student"""
-        try:
+        if symptoms is None:
             symptoms = self._generate_symptoms()
-            return {
-                'student_id': f"S{self.id:04d}",
-                'has_excuse_letter': self.has_excuse_letter,
-                'valid_id': self.has_valid_id,
-                'symptoms': symptoms,
-                'illness_type': 'complex' if len(symptoms) > 2 else 'simple',
-                'timestamp': datetime.now(),
-                'parent_guardian_verified': self.has_valid_id
-            }
-        except Exception as e:
-            logging.error(f"Error generating case: {str(e)}")
+        if timestamp is None:
+            timestamp = datetime.now()
+        if not symptoms:
+            # Nothing to assess; fall back to an unknown, unverified case
             return {
                 'student_id': f"S{self.id:04d}",
                 'has_excuse_letter': False,
                 'valid_id': False,
                 'symptoms': ['unknown'],
                 'illness_type': 'unknown',
-                'timestamp': datetime.now(),
+                'timestamp': timestamp,
                 'parent_guardian_verified': False
             }
+        return {
+            'student_id': f"S{self.id:04d}",
+            'has_excuse_letter': self.has_excuse_letter,
+            'valid_id': self.has_valid_id,
+            'symptoms': symptoms,
+            'illness_type': 'complex' if len(symptoms) > 2 else 'simple',
+            'timestamp': timestamp,
+            'parent_guardian_verified': self.has_valid_id
+        }
 
     def _generate_symptoms(self) -> List[str]:
         """Generate a list of symptoms with weighted probabilities"""
-        simple_symptoms = [
-            'cold', 'flu', 'cough', 'headache', 
-            'fever', 'stomach ache', 'sore throat'
-        ]
-        complex_symptoms = [
-            'recurring fever', 'severe injury', 'chronic pain',
-            'mental health issues', 'surgery recovery', 'infectious disease'
-        ]
-        
         # 70% chance of simple symptoms
         if random.random() < 0.7:
             num_symptoms = random.randint(1, 3)
-            return random.sample(simple_symptoms, num_symptoms)
+            return random.sample(SIMPLE_SYMPTOMS, num_symptoms)
         else:
             # Complex case: mix of simple and complex symptoms
             num_simple = random.randint(0, 2)
             num_complex = random.randint(1, 2)
-            symptoms = random.sample(simple_symptoms, num_simple)
-            symptoms.extend(random.sample(complex_symptoms, num_complex))
+            symptoms = random.sample(SIMPLE_SYMPTOMS, num_simple)
+            symptoms.extend(random.sample(COMPLEX_SYMPTOMS, num_complex))
             return symptoms
 
 class ClinicSimulation:
@@ -89,6 +169,13 @@ class ClinicSimulation:
         self.config = config
         self.callback = callback
         
+        # Finished students, paces the "stats" notifications
+        self.completed = 0
+        
+        # Inter-arrival times, batched like the student draws
+        self._arrivals = (ArrivalDraws(config.RANDOM_BATCH_SIZE)
+                          if config.RANDOM_BATCH_SIZE > 0 else None)
+        
         # Resources
         self.nurses = simpy.Resource(env, capacity=config.MAX_NURSES)
         self.doctors = simpy.Resource(env, capacity=config.MAX_DOCTORS)
@@ -110,39 +197,55 @@ class ClinicSimulation:
             'complex_cases': 0
         }
         
+        # Issued certificates only refresh the stats every STATS_EVERY
+        # completions; run_simulation flushes the remainder at the end
+        self._stats_every = max(1, config.STATS_EVERY)
+        
         # Peak hours definition
         self.peak_hours = [
             (10, 11.5),  # 10:00 AM - 11:30 AM
             (13.5, 17)   # 1:30 PM - 5:00 PM
         ]
+        
+        # Peak flag for every minute of the day; simulation time 0 is opening
+        hours, minutes = map(int, config.OPENING_TIME.split(':'))
+        self._opening_minute = hours * 60 + minutes
+        peak_mask = bytearray(24 * 60)
+        for start, end in self.peak_hours:
+            for minute in range(int(start * 60), int(end * 60) + 1):
+                peak_mask[minute] = 1
+        self._peak_mask = bytes(peak_mask)
 
     def is_peak_hour(self, time: float) -> bool:
-        """Check if current time is during peak hours"""
-        current_hour = (time / 60) % 24
-        return any(start <= current_hour <= end for start, end in self.peak_hours)
+        """Check if a simulation time (minutes since opening) is during peak hours"""
+        return self._peak_mask[(self._opening_minute + int(time)) % 1440] == 1
 
-    def get_arrival_rate(self) -> float:
+    def get_arrival_rate(self, now: Optional[float] = None) -> float:
         """Get student arrival rate based on time of day"""
-        try:
-            current_hour = (self.env.now / 60) % 24
-            if self.is_peak_hour(current_hour):
-                return random.uniform(5, 10)  # One student every 5-10 minutes
-            return random.uniform(15, 25)     # One student every 15-25 minutes
-        except Exception as e:
-            logging.error(f"Error calculating arrival rate: {str(e)}")
-            return 20  # Default to moderate arrival rate
+        peak = self.is_peak_hour(self.env.now if now is None else now)
+        if self._arrivals is not None:
+            return (self._arrivals.peak if peak else self._arrivals.off_peak).next()
+        if peak:
+            return random.uniform(5, 10)  # One student every 5-10 minutes
+        return random.uniform(15, 25)     # One student every 15-25 minutes
 
     def process_student(self, student: Student):
         """Process a student through the clinic system"""
-        arrival_time = self.env.now
-        student.process_times['wait_start'] = arrival_time
-        self.stats['students_in_system'] += 1
+        # Bind the lookups this generator repeats across its yields
+        env = self.env
+        timeout = env.timeout
+        stats = self.stats
+        config = self.config
+        
+        arrival_time = env.now
+        student.wait_start = arrival_time
+        stats['students_in_system'] += 1
         
         # Track peak/off-peak visits
-        if self.is_peak_hour(arrival_time / 60):
-            self.stats['peak_hour_visits'] += 1
+        if self.is_peak_hour(arrival_time):
+            stats['peak_hour_visits'] += 1
         else:
-            self.stats['off_peak_visits'] += 1
+            stats['off_peak_visits'] += 1
         
         # Notify arrival
         self.notify_event("student", {
@@ -156,125 +259,238 @@ class ClinicSimulation:
         # Nurse Assessment
         with self.nurses.request() as nurse:
             yield nurse
-            student.process_times['nurse_start'] = self.env.now
+            student.nurse_start = env.now
             
             # Add visualization delay
-            yield self.env.timeout(1.5)
+            yield timeout(1.5)
             
             # Process through expert system
             nurse_result = analyze_case(student.case_details)
-            yield self.env.timeout(self.config.NURSE_PROCESS_TIME)
+            yield timeout(config.NURSE_PROCESS_TIME)
             
             if nurse_result['decision'] == 'reject':
-                self.stats['nurse_decisions']['refer'] += 1
+                stats['nurse_decisions']['refer'] += 1
                 self.complete_student(student, 'rejected_by_nurse', nurse_result['reason'])
                 return
             
-            self.stats['nurse_decisions']['treat'] += 1
+            stats['nurse_decisions']['treat'] += 1
             
             # Track case complexity
             if nurse_result.get('complexity') == 'complex':
-                self.stats['complex_cases'] += 1
+                stats['complex_cases'] += 1
             else:
-                self.stats['simple_cases'] += 1
+                stats['simple_cases'] += 1
             
             # Doctor consultation if needed
             if nurse_result.get('decision') == 'refer' or nurse_result.get('complexity') == 'complex':
                 with self.doctors.request() as doctor:
                     yield doctor
-                    student.process_times['doctor_start'] = self.env.now
+                    student.doctor_start = env.now
                     
                     # Add visualization delay
-                    yield self.env.timeout(1.5)
+                    yield timeout(1.5)
                     
-                    doctor_result = analyze_case(student.case_details)
-                    yield self.env.timeout(self.config.DOCTOR_PROCESS_TIME)
+                    # The expert system already ran the doctor's rules for
+                    # this case at the nurse stage; its decision stands
+                    doctor_result = nurse_result
+                    yield timeout(config.DOCTOR_PROCESS_TIME)
                     
                     if doctor_result['decision'] == 'reject':
-                        self.stats['doctor_decisions']['deny'] += 1
+                        stats['doctor_decisions']['deny'] += 1
                         self.complete_student(student, 'rejected_by_doctor', doctor_result['reason'])
                         return
                     elif doctor_result['decision'] == 'approve':
-                        self.stats['doctor_decisions']['issue'] += 1
+                        stats['doctor_decisions']['issue'] += 1
             
             # Final processing by clinic staff
             with self.staff.request() as staff:
                 yield staff
-                yield self.env.timeout(self.config.STAFF_PROCESS_TIME)
+                yield timeout(config.STAFF_PROCESS_TIME)
                 
                 # Add visualization delay
-                yield self.env.timeout(1.5)
+                yield timeout(1.5)
                 
-                self.stats['certificates_issued'] += 1
+                stats['certificates_issued'] += 1
                 self.complete_student(student, 'certificate_issued', 
                                    f"Approved by {'doctor' if nurse_result.get('complexity') == 'complex' else 'nurse'}")
 
     def complete_student(self, student: Student, status: str, reason: str = ""):
         """Complete student processing and update statistics"""
-        student.process_times['completion'] = self.env.now
-        wait_time = student.process_times['completion'] - student.process_times['wait_start']
-        self.stats['total_wait_time'] += wait_time
-        self.stats['students_in_system'] -= 1
+        wait_time, total_time = self._record_completion(student, self.env.now)
         
         self.notify_event("completion", {
             'id': student.id,
             'status': status,
             'reason': reason,
             'wait_time': wait_time,
-            'total_time': self.env.now - student.arrival_time
+            'total_time': total_time
         })
         
-        self.update_statistics()
+        if self.completed % self._stats_every == 0 or status != 'certificate_issued':
+            self.update_statistics()
+
+    def _record_completion(self, student: Student, now: float) -> Tuple[float, float]:
+        """Add a finished student to the statistics"""
+        student.completion = now
+        wait_time = student.completion - student.wait_start
+        total_time = student.completion - student.arrival_time
+        self.stats['total_wait_time'] += wait_time
+        self.stats['students_in_system'] -= 1
+        self.completed += 1
+        return wait_time, total_time
+
+    def run_fast(self, until: float, draws: Optional[StudentDraws] = None):
+        """Run the clinic flow without SimPy, up to `until` minutes
+
+        Follows process_student exactly (same stations, delays, decisions
+        and random draws) but keeps a FIFO queue and a free count per
+        station and a heap of pending stage completions instead of SimPy
+        processes. Only "stats" notifications are sent, every STATS_EVERY
+        completions; there are no per-student events to visualize.
+        """
+        NURSE, DOCTOR, STAFF = 0, 1, 2
+        config = self.config
+        stats = self.stats
+        nurse_decisions = stats['nurse_decisions']
+        doctor_decisions = stats['doctor_decisions']
+        stats_every = self._stats_every
+        # (first, second) delay of each station, added in SimPy's order
+        delays = ((1.5, config.NURSE_PROCESS_TIME),
+                  (1.5, config.DOCTOR_PROCESS_TIME),
+                  (config.STAFF_PROCESS_TIME, 1.5))
+        free = [config.MAX_NURSES, config.MAX_DOCTORS, config.MAX_STAFF]
+        queues = (deque(), deque(), deque())
+        pending = []  # (done time, seq, station, student, nurse result)
+        seq = count()
+        push, pop = heapq.heappush, heapq.heappop
+        
+        def start(station, student, result, now):
+            if station == NURSE:
+                student.nurse_start = now
+            elif station == DOCTOR:
+                student.doctor_start = now
+            first, second = delays[station]
+            push(pending, ((now + first) + second, next(seq), station, student, result))
+        
+        def request(station, student, result, now):
+            if free[station]:
+                free[station] -= 1
+                start(station, student, result, now)
+            else:
+                queues[station].append((student, result))
+        
+        def release(station, now):
+            if queues[station]:
+                student, result = queues[station].popleft()
+                start(station, student, result, now)
+            else:
+                free[station] += 1
+        
+        def finish(student, now):
+            self._record_completion(student, now)
+            if self.completed % stats_every == 0:
+                self.update_statistics()
+        
+        student_id = 0
+        next_arrival = self.get_arrival_rate(0)
+        while True:
+            if pending and pending[0][0] < next_arrival:
+                now, _, station, student, result = pop(pending)
+                if now >= until:
+                    break
+            else:
+                now = next_arrival
+                if now >= until:
+                    break
+                student_id += 1
+                stats['total_students'] += 1
+                student = Student(student_id, now, draws.next() if draws else None)
+                student.wait_start = now
+                stats['students_in_system'] += 1
+                if self.is_peak_hour(now):
+                    stats['peak_hour_visits'] += 1
+                else:
+                    stats['off_peak_visits'] += 1
+                request(NURSE, student, None, now)
+                next_arrival = now + self.get_arrival_rate(now)
+                continue
+            
+            if station == NURSE:
+                result = analyze_case(student.case_details)
+                if result['decision'] == 'reject':
+                    nurse_decisions['refer'] += 1
+                    finish(student, now)
+                    release(NURSE, now)
+                    continue
+                nurse_decisions['treat'] += 1
+                if result.get('complexity') == 'complex':
+                    stats['complex_cases'] += 1
+                else:
+                    stats['simple_cases'] += 1
+                if result.get('decision') == 'refer' or result.get('complexity') == 'complex':
+                    request(DOCTOR, student, result, now)
+                else:
+                    request(STAFF, student, result, now)
+            elif station == DOCTOR:
+                if result['decision'] == 'reject':
+                    doctor_decisions['deny'] += 1
+                    finish(student, now)
+                    release(DOCTOR, now)
+                    release(NURSE, now)
+                    continue
+                elif result['decision'] == 'approve':
+                    doctor_decisions['issue'] += 1
+                release(DOCTOR, now)
+                request(STAFF, student, result, now)
+            else:
+                # The nurse stays with the student until the certificate
+                stats['certificates_issued'] += 1
+                finish(student, now)
+                release(STAFF, now)
+                release(NURSE, now)
 
     def format_time(self, minutes: float) -> str:
         """Format simulation time as HH:MM"""
-        try:
-            hours = int(minutes // 60)
-            mins = int(minutes % 60)
-            return f"{hours:02d}:{mins:02d}"
-        except Exception as e:
-            logging.error(f"Error formatting time: {str(e)}")
-            return "00:00"  # Return default time on error
+        if not minutes > 0:
+            return "00:00"
+        return f"{int(minutes // 60):02d}:{int(minutes % 60):02d}"
 
     def notify_event(self, event_type: str, data: Dict[str, Any]):
         """Send event notification through callback"""
+        if not self.callback:
+            return
         try:
-            if self.callback:
-                self.callback(event_type, data)
+            self.callback(event_type, data)
         except Exception as e:
             logging.error(f"Error in event notification: {str(e)}")
 
     def update_statistics(self):
         """Update and notify current statistics"""
         if self.callback:
-            avg_wait_time = (
-                self.stats['total_wait_time'] / 
-                max(1, self.stats['total_students'])
-            )
-            
+            stats = self.stats
+            seen = max(1, stats['total_students'])
             self.callback("stats", {
-                'Patients in System': self.stats['students_in_system'],
+                'Patients in System': stats['students_in_system'],
                 'Waiting for Nurse': 0,
                 'Waiting for Doctor': 0,
-                'Certificates Issued': self.stats['certificates_issued'],
-                'Average Wait': avg_wait_time,
-                'Success Rate': (
-                    self.stats['certificates_issued'] / 
-                    max(1, self.stats['total_students']) * 100
-                ),
-                'Patients Seen': self.stats['total_students'],
-                'Peak Hour Rate': (
-                    self.stats['peak_hour_visits'] /
-                    max(1, self.stats['total_students']) * 100
-                ),
+                'Certificates Issued': stats['certificates_issued'],
+                'Average Wait': stats['total_wait_time'] / seen,
+                'Success Rate': stats['certificates_issued'] / seen * 100,
+                'Patients Seen': stats['total_students'],
+                'Peak Hour Rate': stats['peak_hour_visits'] / seen * 100,
                 'Case Complexity': {
-                    'Simple': self.stats['simple_cases'],
-                    'Complex': self.stats['complex_cases']
+                    'Simple': stats['simple_cases'],
+                    'Complex': stats['complex_cases']
                 }
             })
 
-def run_simulation(duration_hours=8, num_doctors=1, num_nurses=3, event_callback=None, config=None):
-    """Run the clinic simulation"""
+def run_simulation(duration_hours=8, num_doctors=1, num_nurses=3, event_callback=None, config=None,
+                   fast=False):
+    """Run the clinic simulation
+
+    With fast=True the run skips SimPy (see ClinicSimulation.run_fast) and
+    only sends "stats" notifications, for runs nobody watches live.
+    """
     try:
         # Initialize simulation
         env = simpy.Environment()
@@ -285,23 +501,34 @@ def run_simulation(duration_hours=8, num_doctors=1, num_nurses=3, event_callback
             )
         clinic = ClinicSimulation(env, config, event_callback)
         
+        draws = StudentDraws(config.RANDOM_BATCH_SIZE) if config.RANDOM_BATCH_SIZE > 0 else None
+        
         def student_generator(env, clinic):
+            timeout = env.timeout
+            process = env.process
+            get_arrival_rate = clinic.get_arrival_rate
+            process_student = clinic.process_student
+            stats = clinic.stats
             student_id = 0
             while True:
                 # Get next arrival time based on current hour
-                yield env.timeout(clinic.get_arrival_rate())
+                yield timeout(get_arrival_rate())
                 student_id += 1
-                clinic.stats['total_students'] += 1
+                stats['total_students'] += 1
                 
                 # Create and process new student
-                student = Student(student_id, env.now)
-                env.process(clinic.process_student(student))
+                student = Student(student_id, env.now, draws.next() if draws else None)
+                process(process_student(student))
         
-        # Start student generation
-        env.process(student_generator(env, clinic))
-        
-        # Run simulation
-        env.run(until=duration_hours * 60)
+        if fast:
+            clinic.run_fast(duration_hours * 60, draws)
+        else:
+            # Start student generation
+            env.process(student_generator(env, clinic))
+            
+            # Run simulation
+            env.run(until=duration_hours * 60)
+        clinic.update_statistics()
         
         # Prepare final statistics
         final_stats = {